@@ -4,7 +4,7 @@ from __future__ import annotations
 
 import asyncio
 import re
-from typing import Any, AsyncIterator, Dict, List, Optional, TYPE_CHECKING, Union
+from typing import Any, AsyncIterator, Dict, Optional, TYPE_CHECKING, Union
 
 from .event import (
     CodexEventMsg,
@@ -20,6 +20,15 @@ if TYPE_CHECKING:
     from .structured import AggregatedChatEvent, EventAggregator
 
 
+# Marks the end of a turn's events in ``Chat._queue``.
+_END = object()
+
+_UUID_RE = re.compile(
+    r"\b[a-f0-9]{8}-[a-f0-9]{4}-[a-f0-9]{4}-[a-f0-9]{4}-[a-f0-9]{12}\b",
+    re.IGNORECASE,
+)
+
+
 class Chat:
     """Represents a Codex conversation with streaming events and resume support."""
 
@@ -30,16 +39,16 @@ class Chat:
         self._result_or_task: Optional[Any] = None
         self._result_cache: Optional[Any] = None
 
-        # Event storage - can contain either raw events or aggregated events
+        # Event queue - can contain either raw events or aggregated events,
+        # terminated by _END. A chat with no turn yet is already finished.
         self._structured_mode = structured
-        self._events: List[Union[CodexEventMsg, "AggregatedChatEvent"]] = []
-        self._iter_index = 0
-        self._events_complete = True
-        self._event_available: asyncio.Event = asyncio.Event()
-        self._event_available.set()
+        self._queue: "asyncio.Queue[Union[CodexEventMsg, AggregatedChatEvent, object]]" = asyncio.Queue()
+        self._queue.put_nowait(_END)
         self._stream_task: Optional[asyncio.Task[None]] = None
         self._stream_error: Optional[BaseException] = None
         self._last_agent_message: Optional[str] = None
+        # Set once a tool call is cancelled while Codex is still answering it.
+        self._abandoned_call = False
 
         # State for structured aggregation
         if structured:
@@ -48,22 +57,23 @@ class Chat:
         else:
             self._aggregator = None
 
-    def __aiter__(self) -> "Chat":
+    async def __aenter__(self) -> "Chat":
         return self
 
-    async def __anext__(self) -> CodexEventMsg:
-        while True:
-            if self._iter_index < len(self._events):
-                event = self._events[self._iter_index]
-                self._iter_index += 1
-                return event
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await self.aclose()
 
-            if self._events_complete:
-                self._check_stream_error()
-                raise StopAsyncIteration
+    def __aiter__(self) -> "Chat":
+        return self
 
-            await self._wait_for_next_event()
+    async def __anext__(self) -> CodexEventMsg:
+        event = await self._queue.get()
+        if event is _END:
+            # Put the marker back so iterating this turn again also stops.
+            self._queue.put_nowait(_END)
             self._check_stream_error()
+            raise StopAsyncIteration
+        return event
 
     async def get(self) -> str:
         await self._get_result()
@@ -89,6 +99,24 @@ class Chat:
         await self._launch_tool(tool_name, tool_args)
 
 
+    async def aclose(self) -> bool:
+        """Cancel the in-flight tool call and event stream, and wait for them to stop.
+
+        Returns whether a tool call of this chat was abandoned before it
+        finished, now or by an earlier ``resume``. The server is not told
+        about the cancellation and keeps streaming that turn.
+        """
+
+        pending = [
+            task
+            for task in (self._stream_task, self._result_or_task)
+            if isinstance(task, asyncio.Task) and not task.done()
+        ]
+        self._cancel_pending_tasks()
+        if pending:
+            await asyncio.wait(pending)
+        return self._abandoned_call
+
     @property
     def conversation_id(self) -> Optional[str]:
         return self._conversation_id
@@ -97,7 +125,7 @@ class Chat:
         self,
         *,
         prompt: str,
-        config: "CodexChatConfig",
+        config: Optional["CodexChatConfig"],
     ) -> None:
         tool_name, tool_args = self._client._build_initial_tool_args(
             prompt=prompt,
@@ -114,10 +142,7 @@ class Chat:
         self._result_or_task = task
         self._result_cache = None
 
-        self._events = []
-        self._iter_index = 0
-        self._events_complete = event_stream is None
-        self._event_available = asyncio.Event()
+        self._queue = asyncio.Queue()
         self._stream_task = None
         self._stream_error = None
         self._last_agent_message = None
@@ -129,15 +154,23 @@ class Chat:
         task.add_done_callback(self._handle_tool_completion)
 
         if event_stream is not None:
-            self._stream_task = asyncio.create_task(self._consume_events(event_stream))
+            self._stream_task = asyncio.create_task(self._consume_events(event_stream, self._queue))
         else:
-            self._event_available.set()
+            self._queue.put_nowait(_END)
 
-    async def _consume_events(self, event_stream: AsyncIterator[AllEvents]) -> None:
+    async def _consume_events(
+        self,
+        event_stream: AsyncIterator[AllEvents],
+        queue: "asyncio.Queue[Any]",
+    ) -> None:
+        # ``queue`` is bound per turn so a cancelled turn cannot end the next one.
+        put = queue.put_nowait
         try:
             async for event in event_stream:
-                # Track conversation_id and last_agent_message regardless of mode
-                conversation_id = getattr(event, "conversation_id", None)
+                # Track conversation_id and last_agent_message regardless of mode.
+                # The middleware already hands over typed events, so plain
+                # attribute access and isinstance checks are enough here.
+                conversation_id = event.conversation_id
                 if not conversation_id and isinstance(event, SessionConfiguredEvent):
                     conversation_id = event.session_id
                 if conversation_id:
@@ -147,33 +180,21 @@ class Chat:
 
                 # Process event based on mode
                 if self._structured_mode:
-                    await self._process_event_structured(event)
+                    result = self._aggregator.process(event)  # type: ignore[union-attr]
+                    if result is not None:
+                        put(result)
                 else:
-                    self._events.append(event)
-                    self._event_available.set()
+                    put(event)
         except asyncio.CancelledError:
             raise
         except Exception as exc:
             self._stream_error = exc
-            self._event_available.set()
             raise
         finally:
             # Flush incomplete streams in structured mode
             if self._aggregator:
                 self._aggregator.flush_incomplete()
-            self._events_complete = True
-            self._event_available.set()
-
-    async def _process_event_structured(self, event: AllEvents) -> None:
-        """Process an event in structured mode using aggregator."""
-        result = self._aggregator.process(event)  # type: ignore[union-attr]
-        if result is not None:
-            self._events.append(result)
-            self._event_available.set()
-
-    async def _wait_for_next_event(self) -> None:
-        await self._event_available.wait()
-        self._event_available.clear()
+            put(_END)
 
     def _check_stream_error(self) -> None:
         if self._stream_error:
@@ -200,9 +221,12 @@ class Chat:
                 result = await result_or_task
                 self._result_cache = result
 
-                conversation_id = self._extract_conversation_id(result)
-                if conversation_id:
-                    self._conversation_id = conversation_id
+                # The event stream normally reports the id first; only scan
+                # the result text when it has not.
+                if not self._conversation_id:
+                    conversation_id = self._extract_conversation_id(result)
+                    if conversation_id:
+                        self._conversation_id = conversation_id
 
                 return result
             except Exception:
@@ -222,38 +246,35 @@ class Chat:
             and not self._result_or_task.done()
         ):
             self._result_or_task.cancel()
+            self._abandoned_call = True
 
         self._result_or_task = None
 
     def _handle_tool_completion(self, task: asyncio.Task) -> None:
-        """Handle completion (success or failure) of the Codex tool invocation."""
-        self._events_complete = True
+        """Handle completion (success or failure) of the Codex tool invocation.
 
+        The middleware ends the turn's event stream once the task is done, so
+        this only records the failure for ``_END`` to surface.
+        """
         if task.cancelled():
-            self._event_available.set()
             return
 
         exc = task.exception()
         if exc:
             self._stream_error = exc
 
-        self._event_available.set()
-
     @staticmethod
     def _extract_conversation_id(result: Any) -> Optional[str]:
-        if not (hasattr(result, "content") and result.content):
+        content = getattr(result, "content", None)
+        if not content:
             return None
 
-        for content_item in result.content:
-            if hasattr(content_item, "text"):
-                text = content_item.text
-
-                uuid_pattern = r"\b[a-f0-9]{8}-[a-f0-9]{4}-[a-f0-9]{4}-[a-f0-9]{4}-[a-f0-9]{12}\b"
-                matches = re.findall(uuid_pattern, text, re.IGNORECASE)
-                if matches:
-                    return matches[0]
+        for content_item in content:
+            text = getattr(content_item, "text", None)
+            if text is None:
+                continue
+            match = _UUID_RE.search(text)
+            if match:
+                return match.group()
 
         return None
-
-    def __del__(self) -> None:
-        self._cancel_pending_tasks()
@@ -1,83 +1,522 @@
 """Client class for managing Codex MCP connections and conversations."""
 
 import asyncio
-from contextlib import AsyncExitStack
-from typing import Any, AsyncIterator, Dict, Optional, Tuple
+import functools
+import hashlib
+import json
+import sys
+import weakref
+from collections import OrderedDict
+from contextlib import AbstractAsyncContextManager
+from contextvars import Token
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Set, Tuple, Union
 
 from mcp.client.session import ClientSession
 from mcp.client.stdio import StdioServerParameters, stdio_client
 
 from .chat import Chat
-from .config import CodexChatConfig
-from .event import AllEvents
+from .config import CodexChatConfig, SandboxMode
+from .event import (
+    AllEvents,
+    McpToolCallBeginEvent,
+    SessionConfiguredEvent,
+    TaskCompleteEvent,
+)
 from .exceptions import ConnectionError, ToolError
-from .middleware import setup_mcp_middleware
+from .middleware import CodexMiddleware
 
 
-# Set up MCP middleware for streaming and warning suppression
-_middleware = setup_mcp_middleware()
+async def _prefetch_tools(session: ClientSession) -> None:
+    """List the server's tools once the session is up.
+
+    Listing fills the session's output-schema cache, which ``call_tool``
+    would otherwise fill with an extra request after the first result.
+    """
+
+    await session.list_tools()
+
+
+@functools.lru_cache(maxsize=1)
+def _default_config_args() -> Dict[str, Any]:
+    """Tool arguments for the default config, serialized once and only read."""
+
+    return CodexChatConfig().model_dump(exclude_none=True)
+
+
+if sys.version_info >= (3, 12):
+
+    def _start_task(coro: Any) -> asyncio.Task:
+        """Start ``coro`` eagerly, so the request is written before returning."""
+
+        return asyncio.Task(coro, loop=asyncio.get_running_loop(), eager_start=True)
+
+else:
+    _start_task = asyncio.create_task
+
+
+class _DisconnectedSession:
+    """Stands in for the MCP session while the client is not connected.
+
+    Any use raises ``ConnectionError``, so connected code paths can call the
+    session without checking for it first.
+    """
+
+    __slots__ = ()
+
+    def __getattr__(self, name: str) -> Any:
+        raise ConnectionError("Not connected to Codex server. Use 'async with Client()' syntax.")
+
+
+_DISCONNECTED = _DisconnectedSession()
+
+
+_EnvItems = Optional[Tuple[Tuple[str, str], ...]]
+_PoolKey = Tuple[str, Tuple[str, ...], _EnvItems]
+
+
+@functools.lru_cache(maxsize=32)
+def _make_server_params(
+    command: str,
+    args: Tuple[str, ...],
+    env_items: _EnvItems,
+) -> StdioServerParameters:
+    """Build (or reuse) the server parameters; stdio_client only reads them."""
+
+    return StdioServerParameters(
+        command=command,
+        args=list(args),
+        env=dict(env_items) if env_items is not None else None,
+    )
+
+
+class _BackgroundSession:
+    """An MCP connection held open by a background task.
+
+    anyio requires a session's task group to be exited by the task that
+    entered it, so the runner task owns the connection and any task can
+    borrow it in between: pooled clients reuse it, and ``open_many`` can
+    connect from one task while the caller later exits from another.
+    """
+
+    def __init__(self, key: Optional[_PoolKey], server_params: StdioServerParameters) -> None:
+        self.key = key
+        self.middleware = CodexMiddleware()
+        self._loop = asyncio.get_running_loop()
+        self._ready: "asyncio.Future[ClientSession]" = self._loop.create_future()
+        self._closing = asyncio.Event()
+
+        # The runner (and the receive loop it starts) inherits the middleware.
+        token = self.middleware.activate()
+        try:
+            self._runner = asyncio.create_task(self._run(server_params))
+        finally:
+            self.middleware.deactivate(token)
+
+    async def _run(self, server_params: StdioServerParameters) -> None:
+        try:
+            async with stdio_client(server_params) as (read_stream, write_stream):
+                async with ClientSession(read_stream, write_stream) as session:
+                    await session.initialize()
+                    await _prefetch_tools(session)
+                    self._ready.set_result(session)
+                    await self._closing.wait()
+        except Exception as exc:
+            if not self._ready.done():
+                self._ready.set_exception(exc)
+        finally:
+            if not self._ready.done():
+                self._ready.cancel()
+
+    @property
+    def usable(self) -> bool:
+        return not self._runner.done() and self._loop is asyncio.get_running_loop()
+
+    async def session(self) -> ClientSession:
+        return await asyncio.shield(self._ready)
+
+    async def aclose(self) -> None:
+        self._closing.set()
+        if not self._ready.done():
+            # Still starting up; nobody will use the connection.
+            self._runner.cancel()
+        try:
+            await self._runner
+        except asyncio.CancelledError:
+            pass
+
+
+class _SessionPool:
+    """Idle pooled connections keyed by server parameters.
+
+    A connection is lent to one client at a time, so the events on its
+    middleware always belong to that client. Connections left idle for
+    longer than the timeout given at check-in are closed.
+    """
+
+    def __init__(self) -> None:
+        self._idle: Dict[_PoolKey, List[_BackgroundSession]] = {}
+        self._expiry: Dict[_BackgroundSession, asyncio.TimerHandle] = {}
+        self._reaping: Set[asyncio.Task] = set()
+
+    def checkout(self, key: _PoolKey, server_params: StdioServerParameters) -> _BackgroundSession:
+        idle = self._idle.get(key)
+        while idle:
+            entry = idle.pop()
+            self._expiry.pop(entry).cancel()
+            if entry.usable:
+                return entry
+        return _BackgroundSession(key, server_params)
+
+    def checkin(self, key: _PoolKey, entry: _BackgroundSession, idle_timeout: float) -> None:
+        self._idle.setdefault(key, []).append(entry)
+        self._expiry[entry] = asyncio.get_running_loop().call_later(
+            idle_timeout, self._reap, key, entry
+        )
+
+    def _reap(self, key: _PoolKey, entry: _BackgroundSession) -> None:
+        del self._expiry[entry]
+        idle = self._idle[key]
+        idle.remove(entry)
+        if not idle:
+            del self._idle[key]
+        task = asyncio.create_task(entry.aclose())
+        self._reaping.add(task)
+        task.add_done_callback(self._reaping.discard)
+
+    async def close(self) -> None:
+        for handle in self._expiry.values():
+            handle.cancel()
+        self._expiry.clear()
+        entries = [entry for idle in self._idle.values() for entry in idle]
+        self._idle.clear()
+        for entry in entries:
+            if entry.usable:
+                await entry.aclose()
+        if self._reaping:
+            await asyncio.gather(*self._reaping, return_exceptions=True)
+
+
+_POOL = _SessionPool()
+
+
+_MemoEntry = Tuple[Any, Tuple[AllEvents, ...]]
+
+
+class _ToolMemo:
+    """LRU cache of completed tool calls and the events they streamed.
+
+    Only calls that run in the read-only sandbox and use no MCP tools are
+    remembered; replaying any other call would skip the changes it makes.
+    The sandbox does not confine tools on MCP servers, so calls configured
+    with ``mcp_servers`` are never remembered, nor are calls that turn out
+    to invoke a tool (from servers in the user's own Codex config).
+    """
+
+    def __init__(self, max_size: int) -> None:
+        self._max_size = max_size
+        self._entries: "OrderedDict[str, _MemoEntry]" = OrderedDict()
+        # Conversations started by remembered calls, whose replies therefore
+        # run read-only as well.
+        self._read_only_conversations: Set[str] = set()
+
+    def allows(self, tool_name: str, tool_args: Dict[str, Any]) -> bool:
+        """Whether the call runs in the read-only sandbox."""
+
+        if tool_name == "codex-reply":
+            return tool_args.get("conversationId") in self._read_only_conversations
+
+        config = tool_args.get("config", {})
+        if any(key.startswith("mcp_servers.") for key in config):
+            return False
+
+        # An explicit sandbox overrides the one set by the profile.
+        sandbox = tool_args.get("sandbox")
+        if sandbox is None:
+            profile = config.get(f"profiles.{tool_args.get('profile')}", {})
+            sandbox = profile.get("sandbox_mode")
+        return sandbox == SandboxMode.READ_ONLY
+
+    @staticmethod
+    def key(tool_name: str, tool_args: Dict[str, Any]) -> str:
+        # The arguments carry the conversation id for resumed turns, so a
+        # replayed answer always comes from the same conversation context.
+        payload = json.dumps({"t": tool_name, "a": tool_args}, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[_MemoEntry]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def record(
+        self,
+        key: str,
+        task: asyncio.Task,
+        event_stream: AsyncIterator[AllEvents],
+    ) -> AsyncIterator[AllEvents]:
+        """Pass ``event_stream`` through, storing the call once it succeeded."""
+
+        events: List[AllEvents] = []
+        finished = False
+
+        def store(_: Any = None) -> None:
+            if not (finished and task.done()) or task.cancelled() or task.exception():
+                return
+            result = task.result()
+            if getattr(result, "isError", False):
+                return
+            if any(isinstance(event, McpToolCallBeginEvent) for event in events):
+                # The tool may have changed what remembered answers saw.
+                self.clear()
+                return
+            if events and isinstance(events[-1], TaskCompleteEvent):
+                for event in events:
+                    if isinstance(event, SessionConfiguredEvent):
+                        self._read_only_conversations.add(event.session_id)
+                self._entries[key] = (result, tuple(events))
+                self._entries.move_to_end(key)
+                while len(self._entries) > self._max_size:
+                    self._entries.popitem(last=False)
+
+        async def recording() -> AsyncIterator[AllEvents]:
+            nonlocal finished
+            async for event in event_stream:
+                events.append(event)
+                yield event
+            finished = True
+            store()
+
+        # Whichever of the stream and the call ends last stores the entry.
+        task.add_done_callback(store)
+        return recording()
+
+
+async def _replay(events: Tuple[AllEvents, ...]) -> AsyncIterator[AllEvents]:
+    for event in events:
+        yield event
 
 
 class Client:
-    """Manages the MCP connection and spawns chats for Codex conversations."""
+    """Manages the MCP connection and spawns chats for Codex conversations.
+
+    With ``pooled=True`` the Codex server process and its MCP handshake are
+    kept after the client exits and reused by the next pooled client with
+    the same command, arguments and environment. A connection idle for
+    ``pool_idle_timeout`` seconds is closed; call :meth:`shutdown_pool`
+    before the event loop ends to stop the rest. A client that exits with
+    an error, or with a tool call still running, closes its connection
+    instead of returning it.
+
+    With ``memoize=True`` a tool call whose name and arguments match an
+    earlier successful call (including the conversation id of a resumed
+    turn) is answered from an LRU cache of up to ``memo_max`` entries,
+    replaying the recorded events instead of asking Codex again. Only calls
+    in the read-only sandbox that use no MCP tools are remembered, and any
+    other call clears the cache, since it may change what the remembered
+    answers saw. A replayed
+    first turn reports the conversation id of the chat that recorded it, so
+    resuming either chat continues the same conversation on the server.
+    The cache is cleared when the client exits.
+    """
+
+    __slots__ = (
+        "_server_params",
+        "_session",
+        "_stdio",
+        "_middleware",
+        "_middleware_token",
+        "_pool_key",
+        "_pool_idle_timeout",
+        "_background",
+        "_memo",
+        "_chats",
+        "__weakref__",
+    )
 
     def __init__(
         self,
         command: str = "codex",
         args: Optional[list[str]] = None,
         env: Optional[Dict[str, str]] = None,
+        *,
+        pooled: bool = False,
+        pool_idle_timeout: float = 60.0,
+        memoize: bool = False,
+        memo_max: int = 128,
         **_: Any,
     ) -> None:
         if args is None:
             args = ["mcp-server"]
 
-        self._server_params = StdioServerParameters(
-            command=command,
-            args=args,
-            env=env,
-        )
-        self._session: Optional[ClientSession] = None
-        self._exit_stack: Optional[AsyncExitStack] = None
+        # mcp merges ``env`` over the default environment, so an empty
+        # mapping and None start the same server.
+        env_items = tuple(sorted(env.items())) if env else None
+        self._server_params = _make_server_params(command, tuple(args), env_items)
+        self._session: Union[ClientSession, _DisconnectedSession] = _DISCONNECTED
+        self._stdio: Optional[AbstractAsyncContextManager[Any]] = None
+        # Captures the events of this connection only; see __aenter__.
+        self._middleware: Optional[CodexMiddleware] = None
+        self._middleware_token: Optional["Token[Optional[CodexMiddleware]]"] = None
+        self._pool_key: Optional[_PoolKey] = None
+        if pooled:
+            self._pool_key = (command, tuple(args), env_items)
+        self._pool_idle_timeout = pool_idle_timeout
+        self._background: Optional[_BackgroundSession] = None
+        self._memo: Optional[_ToolMemo] = _ToolMemo(memo_max) if memoize else None
+        # Chats opened on this connection, closed explicitly on exit.
+        self._chats: "weakref.WeakSet[Chat]" = weakref.WeakSet()
 
     async def __aenter__(self) -> "Client":
+        if self._pool_key is not None:
+            return await self._enter_in_background()
+
+        # Activated before the session starts so its receive loop task
+        # inherits the context and routes events to this client's queue.
+        self._middleware = CodexMiddleware()
+        self._middleware_token = self._middleware.activate()
+
+        # Exactly two contexts, entered and exited in a fixed order, so they
+        # are driven directly rather than through an AsyncExitStack.
+        stdio = stdio_client(self._server_params)
+        session: Optional[ClientSession] = None
         try:
-            self._exit_stack = AsyncExitStack()
-
-            read_stream, write_stream = await self._exit_stack.enter_async_context(
-                stdio_client(self._server_params)
-            )
-
-            self._session = await self._exit_stack.enter_async_context(
-                ClientSession(read_stream, write_stream)
+            read_stream, write_stream = await stdio.__aenter__()
+            try:
+                session = await ClientSession(read_stream, write_stream).__aenter__()
+                await session.initialize()
+                await _prefetch_tools(session)
+            except BaseException:
+                # Cancellation must unwind too: the contexts' task groups
+                # have to be exited by this task, and the server stopped.
+                exc_info = sys.exc_info()
+                try:
+                    if session is not None:
+                        await session.__aexit__(*exc_info)
+                finally:
+                    await stdio.__aexit__(*exc_info)
+                raise
+        except BaseException as exc:
+            self._release_middleware()
+            if isinstance(exc, Exception):
+                raise ConnectionError("Failed to connect to Codex MCP server") from exc
+            raise
+
+        self._stdio = stdio
+        self._session = session
+        return self
+
+    async def _enter_in_background(self) -> "Client":
+        if self._pool_key is not None:
+            entry = _POOL.checkout(self._pool_key, self._server_params)
+        else:
+            entry = _BackgroundSession(None, self._server_params)
+        try:
+            self._session = await entry.session()
+        except BaseException as exc:
+            await entry.aclose()
+            if isinstance(exc, Exception):
+                raise ConnectionError("Failed to connect to Codex MCP server") from exc
+            raise
+
+        self._background = entry
+        self._middleware = entry.middleware
+        return self
+
+    @classmethod
+    async def open_many(cls, configs: Sequence[Dict[str, Any]]) -> List["Client"]:
+        """Connect several clients concurrently and return them connected.
+
+        Each mapping holds the keyword arguments for one ``Client``. The
+        servers start and complete their handshakes in parallel, so prefer
+        this over entering clients one after another in a loop. Close each
+        returned client with :meth:`aclose`.
+        """
+
+        clients = [cls(**config) for config in configs]
+        try:
+            results = await asyncio.gather(
+                *(client._enter_in_background() for client in clients),
+                return_exceptions=True,
             )
+            failure = next((result for result in results if isinstance(result, BaseException)), None)
+            if failure is not None:
+                raise failure
+        except BaseException:
+            # Includes the caller being cancelled while some clients had
+            # already connected; gather waits for the rest to unwind first.
+            for client in clients:
+                if client.is_connected:
+                    await client.aclose()
+            raise
 
-            await self._session.initialize()
+        return clients
 
-            return self
+    async def aclose(self) -> None:
+        """Close the chats and the connection, as leaving ``async with`` does."""
 
-        except Exception as exc:
-            if self._exit_stack:
-                await self._exit_stack.aclose()
-            raise ConnectionError("Failed to connect to Codex MCP server") from exc
+        await self.__aexit__(None, None, None)
 
     async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
-        if self._exit_stack:
-            await self._exit_stack.aclose()
-
-        if _middleware:
-            _middleware.clear_events()
-
-        self._session = None
+        abandoned_call = False
+        for chat in list(self._chats):
+            if await chat.aclose():
+                abandoned_call = True
+        self._chats.clear()
+        self.clear_memo()
+
+        if self._background is not None:
+            entry, self._background = self._background, None
+            entry.middleware.close_streams()
+            self._session = _DISCONNECTED
+            # A connection that saw an error may be in an unknown state, and
+            # mcp does not tell Codex about a cancelled call, so an abandoned
+            # turn would keep streaming into the next client's events.
+            reusable = exc_type is None and not abandoned_call and entry.usable
+            if reusable and entry.key is not None:
+                _POOL.checkin(entry.key, entry, self._pool_idle_timeout)
+            else:
+                await entry.aclose()
+            return
+
+        stdio, self._stdio = self._stdio, None
+        if stdio is not None:
+            try:
+                if self._session is not _DISCONNECTED:
+                    await self._session.__aexit__(None, None, None)
+            finally:
+                await stdio.__aexit__(None, None, None)
+
+        if self._middleware:
+            self._middleware.close_streams()
+        self._release_middleware()
+
+        self._session = _DISCONNECTED
+
+    def _release_middleware(self) -> None:
+        if self._middleware and self._middleware_token is not None:
+            self._middleware.deactivate(self._middleware_token)
+        self._middleware_token = None
 
     async def create_chat(
         self,
         prompt: str,
         config: Optional[CodexChatConfig] = None,
+        *,
+        structured: bool = True,
     ) -> Chat:
-        """Spawn a new chat by sending the initial prompt to Codex."""
+        """Spawn a new chat by sending the initial prompt to Codex.
+
+        With ``structured=False`` the chat yields the raw event stream
+        (one flat iterator, one ``__anext__`` per delta) instead of grouping
+        deltas into nested per-message streams.
+        """
 
-        chat = Chat(self)
-        config = config or CodexChatConfig()
+        chat = Chat(self, structured=structured)
+        self._chats.add(chat)
 
         try:
             await chat._start(
@@ -89,20 +528,20 @@ class Client:
 
         return chat
 
-    def _ensure_session(self) -> ClientSession:
-        if not self._session:
-            raise ConnectionError("Not connected to Codex server. Use 'async with Client()' syntax.")
-        return self._session
-
     def _build_initial_tool_args(
         self,
         *,
         prompt: str,
-        config: CodexChatConfig,
+        config: Optional[CodexChatConfig],
     ) -> Tuple[str, Dict[str, Any]]:
-        tool_args: Dict[str, Any] = {"prompt": prompt}
+        if config is None:
+            config_args = _default_config_args()
+        else:
+            config_args = config.model_dump(exclude_none=True)
 
-        tool_args.update(config.model_dump(exclude_none=True))
+        # The config serializer never emits "prompt", so the two can be merged
+        # in a single dict display.
+        tool_args: Dict[str, Any] = {"prompt": prompt, **config_args}
 
         return "codex", tool_args
 
@@ -124,19 +563,47 @@ class Client:
         tool_name: str,
         tool_args: Dict[str, Any],
     ) -> Tuple[asyncio.Task, Optional[AsyncIterator[AllEvents]]]:
-        session = self._ensure_session()
-
-        if _middleware:
-            _middleware.clear_events()
-
-        task = asyncio.create_task(session.call_tool(tool_name, tool_args))
+        # Raises ConnectionError when the client is not connected.
+        call_tool = self._session.call_tool
+
+        memo = self._memo
+        memo_key = None
+        if memo is not None:
+            if memo.allows(tool_name, tool_args):
+                memo_key = memo.key(tool_name, tool_args)
+                cached = memo.get(memo_key)
+                if cached is not None:
+                    result, events = cached
+                    return asyncio.create_task(asyncio.sleep(0, result=result)), _replay(events)
+            else:
+                memo.clear()
+
+        middleware = self._middleware
+        if middleware:
+            middleware.clear_events()
+
+        task = _start_task(call_tool(tool_name, tool_args))
 
         event_stream: Optional[AsyncIterator[AllEvents]] = None
-        if _middleware:
-            event_stream = _middleware.get_event_stream()
+        if middleware:
+            event_stream = middleware.get_event_stream(until=task)
+            if memo is not None and memo_key is not None:
+                event_stream = memo.record(memo_key, task, event_stream)
 
         return task, event_stream
 
+    def clear_memo(self) -> None:
+        """Forget the tool calls remembered with ``memoize=True``."""
+
+        if self._memo is not None:
+            self._memo.clear()
+
+    @staticmethod
+    async def shutdown_pool() -> None:
+        """Close the idle connections kept by pooled clients."""
+
+        await _POOL.close()
+
     @property
     def is_connected(self) -> bool:
-        return self._session is not None
+        return self._session is not _DISCONNECTED
@@ -4,9 +4,9 @@ from __future__ import annotations
 
 import base64
 from enum import Enum
-from typing import Annotated, Any, Dict, List, Literal, Optional, Type, Union
+from typing import Annotated, Any, Dict, List, Literal, Optional, Union
 
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter
 
 
 # Constants
@@ -22,6 +22,8 @@ class Duration(BaseModel):
     secs: int
     nanos: int
 
+    model_config = ConfigDict(frozen=True)
+
     def total_seconds(self) -> float:
         """Return the duration expressed as seconds."""
         return self.secs + self.nanos / NANOS_PER_SECOND
@@ -197,7 +199,7 @@ class OutgoingNotificationMeta(BaseModel):
 
     request_id: Optional[Union[str, int]] = Field(None, alias="requestId")
 
-    model_config = ConfigDict(populate_by_name=True)
+    model_config = ConfigDict(populate_by_name=True, frozen=True)
 
 
 class EventMsg(BaseModel):
@@ -385,38 +387,18 @@ CodexEventMsg = AllEvents
 EventMetadata = OutgoingNotificationMeta
 
 
-# Event class mapping for legacy parse_event function
-_EVENT_CLASS_MAP: Dict[str, Type[EventMsg]] = {
-    "agent_message": AgentMessageEvent,
-    "agent_message_delta": AgentMessageDeltaEvent,
-    "agent_reasoning": AgentReasoningEvent,
-    "agent_reasoning_delta": AgentReasoningDeltaEvent,
-    "agent_reasoning_section_break": AgentReasoningSectionBreakEvent,
-    "exec_command_begin": ExecCommandBeginEvent,
-    "exec_command_end": ExecCommandEndEvent,
-    "exec_command_output_delta": ExecCommandOutputDeltaEvent,
-    "mcp_tool_call_begin": McpToolCallBeginEvent,
-    "mcp_tool_call_end": McpToolCallEndEvent,
-    "session_configured": SessionConfiguredEvent,
-    "task_complete": TaskCompleteEvent,
-    "task_started": TaskStartedEvent,
-    "token_count": TokenCountEvent,
-}
+# Built once at import: pydantic-core picks the event class from the "type"
+# discriminator in a single validation call.
+_EVENT_ADAPTER: TypeAdapter[AllEvents] = TypeAdapter(AllEvents)
 
 
 def parse_event(event_data: Dict[str, Any]) -> CodexEventMsg:
-    """Parse raw event payload into a typed Codex event."""
-    event_type = event_data.get("type")
-
-    if not isinstance(event_type, str):
-        raise ValueError("Event payload is missing a 'type' field")
-
-    event_class = _EVENT_CLASS_MAP.get(event_type)
-
-    if not event_class:
-        raise ValueError(f"Unsupported event type: {event_type}")
+    """Parse raw event payload into a typed Codex event.
 
-    return event_class.model_validate(event_data)
+    Raises ``pydantic.ValidationError`` (a ``ValueError``) when the payload has
+    no ``type``, an unsupported one, or fields that do not validate.
+    """
+    return _EVENT_ADAPTER.validate_python(event_data)
 
 
 def parse_notification(notification_data: Dict[str, Any]) -> JsonRpcNotification:
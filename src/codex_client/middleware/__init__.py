@@ -3,77 +3,205 @@
 from __future__ import annotations
 
 import asyncio
+import contextlib
+import functools
 import logging
-from typing import AsyncIterator, Optional
+import warnings
+from contextvars import Token
+from typing import Any, AsyncIterator, Iterator, Optional
 
-from ..event import AllEvents
-from .filter import CodexEventFilter
+from ..event import (
+    AgentMessageDeltaEvent,
+    AgentReasoningDeltaEvent,
+    AllEvents,
+    TaskCompleteEvent,
+)
+from ..exceptions import MiddlewareError
+from .filter import CodexEventFilter, _current_middleware
 
 
-class CodexMiddleware:
-    """Capture Codex MCP events and expose them as an async stream."""
+# Ends the stream reading the queue it is put on.
+_CLOSED = object()
 
-    def __init__(self) -> None:
-        self._event_queue: "asyncio.Queue[AllEvents]" = asyncio.Queue()
-        self._filter = CodexEventFilter(self._event_queue)
 
-    def install(self) -> None:
-        """Attach the filter to the root logger and silence MCP warnings."""
+# Upper bound on a coalesced delta, so a slow consumer still sees text in
+# reasonably sized pieces.
+_MAX_COALESCED_DELTA = 16 * 1024
+
+
+class _EventQueue(asyncio.Queue):
+    """Event queue that merges consecutive text deltas not yet consumed.
+
+    Codex emits one delta per token. When the consumer falls behind, a delta
+    is appended to the still-queued delta of the same type and conversation,
+    so it is woken once per batch instead of once per token.
+    """
+
+    def _put(self, item: Any) -> None:
+        queue = self._queue  # type: ignore[attr-defined]
+        if queue and isinstance(item, (AgentMessageDeltaEvent, AgentReasoningDeltaEvent)):
+            last = queue[-1]
+            if (
+                type(last) is type(item)
+                and last.conversation_id == item.conversation_id
+                and len(last.delta) + len(item.delta) <= _MAX_COALESCED_DELTA
+            ):
+                # Nothing outside the queue references ``last`` yet.
+                last.delta += item.delta
+                return
+        queue.append(item)
+
+    def clear(self) -> None:
+        """Drop every queued item at once."""
+
+        # get_nowait() never touches the unfinished-task count, so clearing
+        # the underlying deque is equivalent to draining it item by item.
+        self._queue.clear()  # type: ignore[attr-defined]
 
-        root_logger = logging.getLogger()
-        root_logger.addFilter(self._filter)
-        logging.getLogger("mcp").setLevel(logging.ERROR)
 
-    async def get_event_stream(self) -> AsyncIterator[AllEvents]:
-        """Yield typed events as they are captured from Codex."""
+class CodexMiddleware:
+    """Capture Codex MCP events and expose them as an async stream."""
 
-        consecutive_timeouts = 0
-        max_consecutive_timeouts = 300
+    def __init__(self) -> None:
+        # Queue of the stream receiving events. A connection streams one turn
+        # at a time, so a new stream supersedes the previous one.
+        self._stream_queue: Optional[_EventQueue] = None
 
+    def install(self) -> None:
+        """Attach the shared filter to the root logger and silence MCP warnings."""
+
+        _install_filter()
+
+    def activate(self) -> "Token[Optional[CodexMiddleware]]":
+        """Capture the events logged from the current context into this middleware.
+
+        Tasks started afterwards (such as an MCP session's receive loop)
+        inherit the context, so their events are routed here as well.
+        """
+
+        self.install()
+        return _current_middleware.set(self)
+
+    def deactivate(self, token: "Token[Optional[CodexMiddleware]]") -> None:
+        """Restore the middleware that was active before :meth:`activate`."""
+
+        try:
+            _current_middleware.reset(token)
+        except ValueError:
+            # Deactivated from another context than the one that activated it;
+            # that context keeps pointing here until it ends.
+            pass
+
+    @contextlib.contextmanager
+    def activated(self) -> Iterator["CodexMiddleware"]:
+        """Activate this middleware for the duration of a ``with`` block."""
+
+        token = self.activate()
+        try:
+            yield self
+        finally:
+            self.deactivate(token)
+
+    def _queue_event(self, event: AllEvents) -> None:
+        queue = self._stream_queue
+        if queue is None:
+            return  # nobody is waiting for events on this connection
+        try:
+            queue.put_nowait(event)
+        except Exception as exc:
+            raise MiddlewareError("failed to enqueue Codex event") from exc
+
+    def get_event_stream(
+        self,
+        until: Optional["asyncio.Future[Any]"] = None,
+    ) -> AsyncIterator[AllEvents]:
+        """Yield typed events as they are captured from Codex.
+
+        The stream ends after ``task_complete``. When ``until`` is given (the
+        tool call task), the stream also ends once it finishes, so a call that
+        fails or is cancelled before ``task_complete`` does not leave the
+        consumer waiting forever. Each stream reads its own queue, so ending
+        one never leaves markers behind for the next.
+        """
+
+        if self._stream_queue is not None:
+            self._end_stream(self._stream_queue)
+
+        queue = _EventQueue()
+        self._stream_queue = queue
+        if until is not None:
+            until.add_done_callback(lambda _: self._end_stream(queue))
+        return self._iter_events(queue)
+
+    @staticmethod
+    async def _iter_events(queue: _EventQueue) -> AsyncIterator[AllEvents]:
         while True:
-            try:
-                event = await asyncio.wait_for(self._event_queue.get(), timeout=1.0)
-                consecutive_timeouts = 0
-                yield event
-                if getattr(event, "type", None) == "task_complete":
-                    break
-            except asyncio.TimeoutError:
-                consecutive_timeouts += 1
-                if consecutive_timeouts >= max_consecutive_timeouts:
-                    raise asyncio.TimeoutError(
-                        f"Event stream stalled - no events received for "
-                        f"{max_consecutive_timeouts} seconds"
-                    )
+            event = await queue.get()
+            if event is _CLOSED:
+                break
+            yield event
+            if isinstance(event, TaskCompleteEvent):
+                break
+
+    def _end_stream(self, queue: _EventQueue) -> None:
+        queue.put_nowait(_CLOSED)
+        if self._stream_queue is queue:
+            self._stream_queue = None
 
     def clear_events(self) -> None:
-        """Remove any queued events."""
+        """Remove any events queued but not yet consumed."""
 
-        while not self._event_queue.empty():
-            try:
-                self._event_queue.get_nowait()
-            except asyncio.QueueEmpty:
-                break
+        if self._stream_queue is not None:
+            self._stream_queue.clear()
 
+    def close_streams(self) -> None:
+        """Drop queued events and end any stream still waiting for more."""
 
-_middleware_instance: Optional[CodexMiddleware] = None
+        queue = self._stream_queue
+        if queue is not None:
+            queue.clear()
+            self._end_stream(queue)
 
 
-def setup_mcp_middleware() -> CodexMiddleware:
-    """Create (or return) the global Codex middleware instance."""
+@functools.lru_cache(maxsize=1)
+def _install_filter() -> CodexEventFilter:
+    """Attach the one filter that serves every middleware, on first use."""
 
-    global _middleware_instance
+    event_filter = CodexEventFilter()
+    logging.getLogger().addFilter(event_filter)
+    logging.getLogger("mcp").setLevel(logging.ERROR)
+    return event_filter
 
-    if _middleware_instance is None:
-        _middleware_instance = CodexMiddleware()
-        _middleware_instance.install()
 
-    return _middleware_instance
+def setup_mcp_middleware() -> CodexMiddleware:
+    """Return the middleware active in the current context, creating one if needed.
+
+    .. deprecated::
+        Each ``Client`` now captures its own events, so there is no global
+        middleware to set up. A middleware created here stays active for the
+        rest of the current context and only receives events logged from it.
+        Use ``CodexMiddleware().activated()`` (or ``activate``/``deactivate``)
+        to capture events for a bounded scope instead.
+    """
+
+    warnings.warn(
+        "setup_mcp_middleware() is deprecated; each Client captures its own "
+        "events. Use CodexMiddleware().activated() to capture events for a scope.",
+        DeprecationWarning,
+        stacklevel=2,
+    )
+
+    middleware = _current_middleware.get()
+    if middleware is None:
+        middleware = CodexMiddleware()
+        middleware.activate()
+    return middleware
 
 
 def get_middleware() -> Optional[CodexMiddleware]:
-    """Return the global middleware instance if one has been created."""
+    """Return the middleware active in the current context, if any."""
 
-    return _middleware_instance
+    return _current_middleware.get()
 
 
 __all__ = [
@@ -2,45 +2,62 @@
 
 from __future__ import annotations
 
-import asyncio
 import logging
+from contextvars import ContextVar
+from typing import TYPE_CHECKING, Optional
 
-from ..event import AllEvents
-from ..exceptions import MiddlewareError
 from .parser import parse_event_from_message
 
+if TYPE_CHECKING:
+    from . import CodexMiddleware
+
+
+# Middleware of the client whose MCP session runs in the current context. The
+# client sets it before opening its session, so the session's receive loop
+# task, which logs the notifications, inherits it.
+_current_middleware: "ContextVar[Optional[CodexMiddleware]]" = ContextVar(
+    "codex_middleware", default=None
+)
+
 
 class CodexEventFilter(logging.Filter):
-    """Filter Codex MCP validation warnings while capturing event payloads."""
+    """Filter Codex MCP validation warnings while capturing event payloads.
 
-    def __init__(self, event_queue: "asyncio.Queue[AllEvents]") -> None:
-        super().__init__()
-        self._event_queue = event_queue
+    A single instance is shared by every client; captured events go to the
+    middleware active in the context the record was logged from.
+    """
 
     def filter(self, record: logging.LogRecord) -> bool:
         """Filter log records, capturing Codex events and suppressing warnings."""
 
-        if not hasattr(record, "getMessage"):
+        middleware = _current_middleware.get()
+        if middleware is None:
+            return True
+
+        # Installed on the root logger, so this runs for every record in the
+        # process; the MCP warnings we care about are all WARNING or above.
+        if record.levelno < logging.WARNING:
             return True
 
-        message = record.getMessage()
+        # Gate on the unformatted template first: mcp writes the markers into
+        # the message text itself, so unrelated records never pay for
+        # getMessage()'s %-formatting.
+        template = record.msg
+        if not isinstance(template, str):
+            return True
 
-        if "Failed to validate notification" in message and "codex/event" in message:
-            event = parse_event_from_message(message)
-            if event is not None:
-                self._queue_event(event)
-            return False
+        if "Failed to validate notification" in template:
+            message = record.getMessage() if record.args else template
+            if "codex/event" in message:
+                event = parse_event_from_message(message)
+                if event is not None:
+                    middleware._queue_event(event)
+                return False
 
-        if "validation errors for ServerNotification" in message:
+        if "validation errors for ServerNotification" in template:
             return False
 
         return True
 
-    def _queue_event(self, event: AllEvents) -> None:
-        try:
-            self._event_queue.put_nowait(event)
-        except Exception as exc:
-            raise MiddlewareError("failed to enqueue Codex event") from exc
-
 
 __all__ = ["CodexEventFilter"]
@@ -3,13 +3,50 @@
 from __future__ import annotations
 
 import ast
-import json
 import re
 from typing import Any, Dict, Optional
 
 from ..event import CodexEventMsg, parse_event, parse_notification, JsonRpcNotification
 
-_PARAMS_PATTERN = re.compile(r"params=(\{.*?\})\s+jsonrpc=", re.DOTALL)
+_PARAMS_ANCHOR = "params={"
+
+# Characters that can change the brace scanner's state.
+_STRUCTURAL = re.compile(r"[{}'\"]")
+# Remainder of a quoted string literal, up to and including its closing quote.
+_STRING_TAIL = {
+    "'": re.compile(r"[^'\\]*(?:\\.[^'\\]*)*'", re.DOTALL),
+    '"': re.compile(r'[^"\\]*(?:\\.[^"\\]*)*"', re.DOTALL),
+}
+
+
+def _slice_dict(message: str, start: int) -> Optional[str]:
+    """Return the brace-balanced dict literal that opens at ``message[start]``.
+
+    Braces inside quoted strings (and escaped quotes within them) are skipped,
+    so the slice ends at the dict's own closing brace in a single pass. The
+    regexes below never backtrack, so the scan stays linear in the payload
+    size and the bulk of it runs inside the regex engine rather than Python.
+    """
+    search = _STRUCTURAL.search
+    depth = 0
+    pos = start
+    while True:
+        match = search(message, pos)
+        if match is None:
+            return None
+        char = match.group()
+        pos = match.end()
+        if char == "{":
+            depth += 1
+        elif char == "}":
+            depth -= 1
+            if depth == 0:
+                return message[start:pos]
+        else:
+            closing = _STRING_TAIL[char].match(message, pos)
+            if closing is None:
+                return None
+            pos = closing.end()
 
 
 def _extract_params(message: str) -> Optional[Dict[str, Any]]:
@@ -17,16 +54,18 @@ def _extract_params(message: str) -> Optional[Dict[str, Any]]:
 
     This is a shared helper to eliminate duplication between extraction functions.
     """
-    match = _PARAMS_PATTERN.search(message)
-    if not match:
+    anchor = message.find(_PARAMS_ANCHOR)
+    if anchor == -1:
         return None
 
-    params_fragment = match.group(1)
+    params_fragment = _slice_dict(message, anchor + len(_PARAMS_ANCHOR) - 1)
+    if params_fragment is None:
+        return None
 
-    for loader in (_load_via_ast, _load_via_json):
-        params = loader(params_fragment)
-        if isinstance(params, dict):
-            return params
+    # mcp logs the params as a Python repr, which literal_eval reads directly.
+    params = _load_via_ast(params_fragment)
+    if isinstance(params, dict):
+        return params
 
     return None
 
@@ -41,11 +80,12 @@ def extract_event_payload(message: str) -> Optional[Dict[str, Any]]:
     meta = params.get("_meta")
     conversation_id = params.get("conversationId")
     if isinstance(msg, dict) and isinstance(meta, dict):
-        event_dict = dict(msg)
-        event_dict["_meta"] = meta
+        # ``params`` was just built by literal_eval and nothing else holds it,
+        # so the event dict can be completed in place instead of copied.
+        msg["_meta"] = meta
         if conversation_id is not None:
-            event_dict["conversationId"] = conversation_id
-        return event_dict
+            msg["conversationId"] = conversation_id
+        return msg
 
     return None
 
@@ -103,13 +143,6 @@ def _load_via_ast(fragment: str) -> Optional[Dict[str, Any]]:
         return None
 
 
-def _load_via_json(fragment: str) -> Optional[Dict[str, Any]]:
-    try:
-        return json.loads(fragment)
-    except json.JSONDecodeError:
-        return None
-
-
 __all__ = [
     "extract_event_payload",
     "parse_event_from_message",
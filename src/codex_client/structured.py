@@ -62,6 +62,22 @@ class _AsyncStreamBuffer(Generic[T]):
             self._data_ready.clear()
             await self._data_ready.wait()
 
+    async def iter_batches(self) -> AsyncIterator[List[T]]:
+        if self._stream_started:
+            raise RuntimeError("stream() already consumed")
+        self._stream_started = True
+        index = 0
+        while True:
+            if index < len(self._items):
+                batch = self._items[index:]
+                index += len(batch)
+                yield batch
+                continue
+            if self._completed.is_set():
+                break
+            self._data_ready.clear()
+            await self._data_ready.wait()
+
     async def wait_complete(self) -> None:
         await self._completed.wait()
 
@@ -156,6 +172,11 @@ class _BaseTextStream:
         async for chunk in self._buffer.iter():
             yield chunk
 
+    async def stream_batches(self) -> AsyncIterator[List[str]]:
+        """Stream lists of all text chunks buffered since the previous batch."""
+        async for batch in self._buffer.iter_batches():
+            yield batch
+
     async def wait_complete(self) -> None:
         """Wait until the stream is complete."""
         await self._buffer.wait_complete()
@@ -230,11 +251,16 @@ class CommandStream:
         self.end_event: Optional[ExecCommandEndEvent] = None
 
     def add_output(self, event: ExecCommandOutputDeltaEvent) -> None:
+        # Decode base64 once and derive the text from those bytes; most output is
+        # plain ASCII, which decodes without entering the exception path at all.
         data = event.decoded_chunk
-        try:
-            text = event.decoded_text
-        except UnicodeDecodeError:
-            text = None
+        if data.isascii():
+            text = data.decode("ascii")
+        else:
+            try:
+                text = data.decode("utf-8")
+            except UnicodeDecodeError:
+                text = None
         self._buffer.append(CommandOutputChunk(stream=event.stream, data=data, text=text))
 
     def complete(self, event: ExecCommandEndEvent) -> None:
@@ -256,6 +282,11 @@ class CommandStream:
         async for chunk in self._buffer.iter():
             yield chunk
 
+    async def stream_batches(self) -> AsyncIterator[List[CommandOutputChunk]]:
+        """Stream lists of all output chunks buffered since the previous batch."""
+        async for batch in self._buffer.iter_batches():
+            yield batch
+
     async def wait_complete(self) -> None:
         await self._buffer.wait_complete()
 
@@ -4,13 +4,15 @@ import inspect
 import socket
 import threading
 import time
-from typing import Any, Callable, List, Optional, Tuple
-
-import httpx
-from fastmcp import FastMCP
+from typing import TYPE_CHECKING, Any, Callable, List, Optional, Tuple
 
 from ..exceptions import ConnectionError as CodexConnectionError
 
+if TYPE_CHECKING:
+    # fastmcp and httpx are imported where they are used so that importing
+    # codex_client for a plain Client does not load the HTTP server stack.
+    from fastmcp import FastMCP
+
 
 class MCPServer:
     """HTTP server for MCP tool endpoints using FastMCP."""
@@ -27,7 +29,7 @@ class MCPServer:
         self._server_thread: Optional[threading.Thread] = None
         self._ready = False
         self._log_level = log_level
-        self._mcp_app: Optional[FastMCP] = None
+        self._mcp_app: Optional["FastMCP"] = None
 
     def _pick_port(self, host: str) -> int:
         """Pick an available port on the given host."""
@@ -66,8 +68,10 @@ class MCPServer:
 
         return methods
 
-    def _create_mcp_app(self) -> FastMCP:
+    def _create_mcp_app(self) -> "FastMCP":
         """Create FastMCP application with tool endpoints."""
+        from fastmcp import FastMCP
+
         mcp = FastMCP(name=self.tool_instance.__class__.__name__)
 
         # Add health check endpoint
@@ -122,6 +126,8 @@ class MCPServer:
 
     def _wait_ready(self, host: str, port: int, timeout: float = 10.0):
         """Wait for server to be ready by checking health endpoint."""
+        import httpx
+
         health_url = f"http://{host}:{port}/health"
         start = time.time()
         last_err = None
@@ -148,7 +154,7 @@ class MCPServer:
         return self._ready
 
     @property
-    def mcp_app(self) -> Optional[FastMCP]:
+    def mcp_app(self) -> Optional["FastMCP"]:
         """Get the FastMCP application instance (for debugging/monitoring)."""
         return self._mcp_app
 
@@ -0,0 +1,103 @@
+"""
+Console helpers shared by the example scripts.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import sys
+import threading
+from typing import Optional
+
+try:
+    import uvloop
+except ImportError:  # optional speedup; not available on Windows
+    uvloop = None
+
+
+class StreamWriter:
+    """Coalesce streamed deltas into fewer stdout writes.
+
+    Text is encoded into a byte buffer and handed to the binary stdout layer
+    once ``max_buffer`` bytes are pending or ``delay`` seconds have passed
+    since the first pending write, whichever comes first. Call :meth:`flush`
+    at logical boundaries before printing anything else.
+    """
+
+    def __init__(self, *, max_buffer: int = 4096, delay: float = 0.02) -> None:
+        self._buffer = bytearray()
+        self._max_buffer = max_buffer
+        self._delay = delay
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._encoding = sys.stdout.encoding or "utf-8"
+
+    def write(self, text: str) -> None:
+        self._buffer += text.encode(self._encoding, "replace")
+        if len(self._buffer) >= self._max_buffer:
+            self.flush()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(self._delay, self.flush)
+
+    def flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self._buffer:
+            # Push out anything print() left in the text layer to keep ordering.
+            sys.stdout.flush()
+            sys.stdout.buffer.write(self._buffer)
+            self._buffer.clear()
+        sys.stdout.buffer.flush()
+
+
+out = StreamWriter()
+
+_RULE = "=" * 60
+
+
+def banner(title: str) -> str:
+    """Return ``title`` framed by rules."""
+    return f"\n{_RULE}\n{title}\n{_RULE}\n"
+
+
+def heading(title: str) -> str:
+    """Return ``title`` underlined."""
+    return f"\n{title}\n{'-' * len(title)}\n"
+
+
+async def read_prompt(prompt: str) -> str:
+    """Read a stripped line from stdin without blocking the event loop.
+
+    ``input()`` runs on a daemon thread rather than the default executor so
+    that an interrupted prompt does not hold up interpreter shutdown.
+    """
+    loop = asyncio.get_running_loop()
+    future: asyncio.Future[str] = loop.create_future()
+
+    def _settle(result: Optional[str], exc: Optional[BaseException]) -> None:
+        if future.done():
+            return
+        if exc is not None:
+            future.set_exception(exc)
+        else:
+            future.set_result(result)
+
+    def _read() -> None:
+        try:
+            line = input(prompt).strip()
+        except BaseException as exc:  # noqa: BLE001 - EOFError/KeyboardInterrupt go to the caller
+            loop.call_soon_threadsafe(_settle, None, exc)
+        else:
+            loop.call_soon_threadsafe(_settle, line, None)
+
+    threading.Thread(target=_read, name="prompt-reader", daemon=True).start()
+    return await future
+
+
+def run(coro) -> None:
+    """Run ``coro`` on uvloop when it is installed, otherwise on asyncio's default loop."""
+    if uvloop is None:
+        asyncio.run(coro)
+        return
+    with asyncio.Runner(loop_factory=uvloop.new_event_loop) as runner:
+        runner.run(coro)
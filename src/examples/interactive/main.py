@@ -8,6 +8,7 @@ from __future__ import annotations
 
 import asyncio
 import sys
+from pathlib import Path
 from typing import Optional
 
 from codex_client import (
@@ -27,6 +28,11 @@ from codex_client import (
 )
 from codex_client.event import McpToolCallBeginEvent, McpToolCallEndEvent  # type: ignore
 
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from console import out, read_prompt, run  # noqa: E402
+
+
 WELCOME_MESSAGE = """\
 🤖 Codex Client Interactive Chat
 ================================
@@ -49,82 +55,91 @@ async def _stream_turn(chat) -> Optional[str]:
     """
     final_reply: Optional[str] = None
 
-    async for event in chat:
-        if isinstance(event, AssistantMessageStream):
-            print("\n🧠 Assistant:", end=" ", flush=True)
-            chunks = []
-            async for chunk in event.stream():
-                chunks.append(chunk)
-                print(chunk, end="", flush=True)
-            final_reply = "".join(chunks).strip() or None
-            print("\n")
-            continue
-
-        if isinstance(event, ReasoningStream):
-            print("🧐 Reasoning:", end=" ", flush=True)
-            async for chunk in event.stream():
-                print(chunk, end="", flush=True)
-            print()
-            continue
-
-        if isinstance(event, CommandStream):
-            command_str = " ".join(event.command)
-            print(f"\n⚡ Command: {command_str}")
-            async for chunk in event.stream():
-                if chunk.text is not None:
-                    print(chunk.text, end="", flush=True)
-                else:
-                    print(f"[binary chunk: {len(chunk.data)} bytes]", flush=True)
-            if event.exit_code is not None:
-                duration = event.duration.total_seconds() if event.duration else None
-                status = "✅" if event.exit_code == 0 else "❌"
-                details = f"{status} exit {event.exit_code}"
-                if duration is not None:
-                    details += f" ({duration:.2f}s)"
-                print(details)
-            print()
-            continue
-
-        if isinstance(event, SessionConfiguredEvent):
-            print(
-                f"\n🔧 Session configured with model '{event.model}'"
-                + (f" | reasoning: {event.reasoning_effort.value}" if event.reasoning_effort else "")
-            )
-            continue
-
-        if isinstance(event, TaskStartedEvent):
-            context = (
-                f"{event.model_context_window:,} tokens"
-                if event.model_context_window is not None
-                else "unknown context"
-            )
-            print(f"\n🚀 Task started ({context})")
-            continue
-
-        if isinstance(event, TaskCompleteEvent):
-            print("🎉 Task complete")
-            continue
-
-        if isinstance(event, TokenCountEvent):
-            total = event.info.total_token_usage.total_tokens if event.info else None
-            delta = event.info.last_token_usage.total_tokens if event.info else None
-            if total is not None and delta is not None:
-                print(f"💰 Tokens used: {total:,} total (+{delta:,} this turn)")
-            continue
-
-        if isinstance(event, McpToolCallBeginEvent):
-            args = ", ".join(f"{k}={v}" for k, v in event.invocation.arguments.items())
-            print(f"\n🔧 Tool call: {event.invocation.server}.{event.invocation.tool}({args})")
-            continue
-
-        if isinstance(event, McpToolCallEndEvent):
-            duration = event.duration.total_seconds()
-            result_type = "Ok" if hasattr(event.result, "Ok") else "Err"
-            print(f"🔧 Tool finished in {duration:.2f}s ({result_type})")
-            continue
+    # Resolve the final reply concurrently with streaming instead of after it.
+    message_task = asyncio.create_task(chat.get())
+    try:
+        async for event in chat:
+            if isinstance(event, AssistantMessageStream):
+                out.write("\n🧠 Assistant: ")
+                chunks = []
+                async for batch in event.stream_batches():
+                    chunks.extend(batch)
+                    out.write("".join(batch))
+                final_reply = "".join(chunks).strip() or None
+                out.write("\n\n")
+                continue
+
+            if isinstance(event, ReasoningStream):
+                out.write("🧐 Reasoning: ")
+                async for batch in event.stream_batches():
+                    out.write("".join(batch))
+                out.write("\n")
+                continue
+
+            if isinstance(event, CommandStream):
+                out.write(f"\n⚡ Command: {' '.join(event.command)}\n")
+                async for batch in event.stream_batches():
+                    for chunk in batch:
+                        if chunk.text is not None:
+                            out.write(chunk.text)
+                        else:
+                            out.write(f"[binary chunk: {len(chunk.data)} bytes]\n")
+                if event.exit_code is not None:
+                    status = "✅" if event.exit_code == 0 else "❌"
+                    details = f"{status} exit {event.exit_code}"
+                    if event.duration is not None:
+                        details += f" ({event.duration.total_seconds():.2f}s)"
+                    out.write(details + "\n")
+                out.write("\n")
+                continue
+
+            if isinstance(event, SessionConfiguredEvent):
+                out.write(
+                    f"\n🔧 Session configured with model '{event.model}'"
+                    + (f" | reasoning: {event.reasoning_effort.value}" if event.reasoning_effort else "")
+                    + "\n"
+                )
+                continue
+
+            if isinstance(event, TaskStartedEvent):
+                context = (
+                    f"{event.model_context_window:,} tokens"
+                    if event.model_context_window is not None
+                    else "unknown context"
+                )
+                out.write(f"\n🚀 Task started ({context})\n")
+                continue
+
+            if isinstance(event, TaskCompleteEvent):
+                out.write("🎉 Task complete\n")
+                continue
+
+            if isinstance(event, TokenCountEvent):
+                total = event.info.total_token_usage.total_tokens if event.info else None
+                delta = event.info.last_token_usage.total_tokens if event.info else None
+                if total is not None and delta is not None:
+                    out.write(f"💰 Tokens used: {total:,} total (+{delta:,} this turn)\n")
+                continue
+
+            if isinstance(event, McpToolCallBeginEvent):
+                args = ", ".join(f"{k}={v}" for k, v in (event.invocation.arguments or {}).items())
+                out.write(f"\n🔧 Tool call: {event.invocation.server}.{event.invocation.tool}({args})\n")
+                continue
+
+            if isinstance(event, McpToolCallEndEvent):
+                duration = event.duration.total_seconds()
+                result_type = "Ok" if hasattr(event.result, "Ok") else "Err"
+                out.write(f"🔧 Tool finished in {duration:.2f}s ({result_type})\n")
+                continue
+    except BaseException:
+        message_task.cancel()
+        raise
+    finally:
+        # Drain buffered output before the caller goes back to print().
+        out.flush()
 
     # Ensure the final assistant response is available before returning
-    message = await chat.get()
+    message = await message_task
     return final_reply or message
 
 
@@ -141,7 +156,7 @@ async def run_interactive_chat() -> None:
     config = CodexChatConfig(profile=profile)
 
     try:
-        initial_prompt = input("📝 Enter your prompt (default: Introduce yourself): ").strip()
+        initial_prompt = await read_prompt("📝 Enter your prompt (default: Introduce yourself): ")
     except (EOFError, KeyboardInterrupt):
         print("\n👋 Goodbye!")
         return
@@ -162,7 +177,7 @@ async def run_interactive_chat() -> None:
                 print(f"📬 Final reply: {preview}")
 
             try:
-                follow_up = input("\n💬 Next prompt (leave blank to exit): ").strip()
+                follow_up = await read_prompt("\n💬 Next prompt (leave blank to exit): ")
             except (EOFError, KeyboardInterrupt):
                 print("\n👋 Goodbye!")
                 break
@@ -177,7 +192,7 @@ async def run_interactive_chat() -> None:
 
 def main() -> None:
     try:
-        asyncio.run(run_interactive_chat())
+        run(run_interactive_chat())
     except KeyboardInterrupt:
         print("\n👋 Interrupted.")
 
@@ -8,6 +8,7 @@ from __future__ import annotations
 import asyncio
 import subprocess
 import sys
+from pathlib import Path
 from typing import Optional
 
 from codex_client import (
@@ -25,6 +26,9 @@ from codex_client import (
 )
 from codex_client.event import McpToolCallBeginEvent, McpToolCallEndEvent
 
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from console import banner, heading, out, run  # noqa: E402
+
 from prompt import MCP_SYSTEM_PROMPT, WELCOME_MESSAGE, format_demo_output, get_demo_prompt
 
 
@@ -32,47 +36,55 @@ async def _stream_response(chat) -> str:
     """Stream assistant output for a single Codex turn and return the final message."""
     assistant_chunks: list[str] = []
 
-    async for event in chat:
-        if isinstance(event, AssistantMessageStream):
-            async for chunk in event.stream():
-                assistant_chunks.append(chunk)
-            continue
-
-        if isinstance(event, ReasoningStream):
-            print("🧐 Reasoning stream:")
-            async for chunk in event.stream():
-                print(f"  {chunk}")
-            continue
-
-        if isinstance(event, CommandStream):
-            command_str = " ".join(event.command)
-            print(f"⚡ Command executed: {command_str}")
-            async for chunk in event.stream():
-                if chunk.text:
-                    print(chunk.text, end="", flush=True)
-                else:
-                    print(f"[binary output: {len(chunk.data)} bytes]", flush=True)
-            if event.exit_code is not None:
-                status = "✅" if event.exit_code == 0 else "❌"
-                duration = event.duration.total_seconds() if event.duration else None
-                details = f"{status} exit {event.exit_code}"
-                if duration is not None:
-                    details += f" in {duration:.2f}s"
-                print(details)
-            continue
-
-        if isinstance(event, McpToolCallBeginEvent):
-            args = ", ".join(f"{k}={v}" for k, v in event.invocation.arguments.items())
-            print(f"🔧 Tool call: {event.invocation.server}.{event.invocation.tool}({args})")
-            continue
-
-        if isinstance(event, McpToolCallEndEvent):
-            duration = event.duration.total_seconds()
-            result_type = "Ok" if hasattr(event.result, "Ok") else "Err"
-            print(f"🔧 Tool finished in {duration:.2f}s ({result_type})")
-            continue
-
-    final_message = await chat.get()
+    # Resolve the final reply concurrently with streaming instead of after it.
+    message_task = asyncio.create_task(chat.get())
+    try:
+        async for event in chat:
+            if isinstance(event, AssistantMessageStream):
+                async for batch in event.stream_batches():
+                    assistant_chunks.extend(batch)
+                continue
+
+            if isinstance(event, ReasoningStream):
+                out.write("🧐 Reasoning stream:\n")
+                async for chunk in event.stream():
+                    out.write(f"  {chunk}\n")
+                continue
+
+            if isinstance(event, CommandStream):
+                out.write(f"⚡ Command executed: {' '.join(event.command)}\n")
+                async for batch in event.stream_batches():
+                    for chunk in batch:
+                        if chunk.text:
+                            out.write(chunk.text)
+                        else:
+                            out.write(f"[binary output: {len(chunk.data)} bytes]\n")
+                if event.exit_code is not None:
+                    status = "✅" if event.exit_code == 0 else "❌"
+                    summary = f"{status} exit {event.exit_code}"
+                    if event.duration is not None:
+                        summary += f" in {event.duration.total_seconds():.2f}s"
+                    out.write(summary + "\n")
+                continue
+
+            if isinstance(event, McpToolCallBeginEvent):
+                args = ", ".join(f"{k}={v}" for k, v in (event.invocation.arguments or {}).items())
+                out.write(f"🔧 Tool call: {event.invocation.server}.{event.invocation.tool}({args})\n")
+                continue
+
+            if isinstance(event, McpToolCallEndEvent):
+                duration = event.duration.total_seconds()
+                result_type = "Ok" if hasattr(event.result, "Ok") else "Err"
+                out.write(f"🔧 Tool finished in {duration:.2f}s ({result_type})\n")
+                continue
+    except BaseException:
+        message_task.cancel()
+        raise
+    finally:
+        # Drain buffered output before the caller goes back to print().
+        out.flush()
+
+    final_message = await message_task
     return final_message or "".join(assistant_chunks).strip()
 
 
@@ -85,14 +97,12 @@ async def _run_scenario(
     config: CodexChatConfig,
     scenario_key: str,
     *,
-    heading: Optional[str] = None,
+    title: Optional[str] = None,
 ) -> str:
     """Create a chat for the given scenario and return the assistant response."""
     task_prompt = get_demo_prompt(scenario_key)
-    if heading:
-        print(f"\n{heading}")
-        print("-" * len(heading))
-    print(f"📝 Prompt: {task_prompt}")
+    out.write(f"{heading(title) if title else ''}📝 Prompt: {task_prompt}\n")
+    out.flush()
     prompt = _compose_prompt(task_prompt)
 
     async with Client() as client:
@@ -139,10 +149,11 @@ def _build_http_config() -> CodexChatConfig:
 
 async def run_stdio_demo() -> bool:
     """Execute the stdio transport demo."""
-    print("\n" + "=" * 60)
-    print("📡 STDIO TRANSPORT DEMO")
-    print("=" * 60)
-    print("Using: npx -y @modelcontextprotocol/server-everything\n")
+    out.write(
+        banner("📡 STDIO TRANSPORT DEMO")
+        + "Using: npx -y @modelcontextprotocol/server-everything\n\n"
+    )
+    out.flush()
 
     config = _build_stdio_config()
     success = True
@@ -152,7 +163,7 @@ async def run_stdio_demo() -> bool:
             response = await _run_scenario(
                 config,
                 scenario,
-                heading=f"Scenario: {scenario}",
+                title=f"Scenario: {scenario}",
             )
             print(format_demo_output("stdio", scenario, response))
         except Exception as exc:  # noqa: BLE001
@@ -166,10 +177,11 @@ async def run_stdio_demo() -> bool:
 
 async def run_http_demo() -> bool:
     """Execute the HTTP transport demo (requires local Everything server)."""
-    print("\n" + "=" * 60)
-    print("🌐 HTTP TRANSPORT DEMO")
-    print("=" * 60)
-    print("Using: npx -y @modelcontextprotocol/server-everything streamableHttp\n")
+    out.write(
+        banner("🌐 HTTP TRANSPORT DEMO")
+        + "Using: npx -y @modelcontextprotocol/server-everything streamableHttp\n\n"
+    )
+    out.flush()
 
     server_process: Optional[subprocess.Popen[str]] = None
     try:
@@ -192,7 +204,7 @@ async def run_http_demo() -> bool:
                 response = await _run_scenario(
                     config,
                     scenario,
-                    heading=f"Scenario: {scenario}",
+                    title=f"Scenario: {scenario}",
                 )
                 print(format_demo_output("http", scenario, response))
             except Exception as exc:  # noqa: BLE001
@@ -220,9 +232,8 @@ async def main() -> None:
     http_success = await run_http_demo()
 
     completed = sum(1 for success in (stdio_success, http_success) if success)
-    print("\n" + "=" * 60)
-    print(f"📊 DEMO SUMMARY: {completed}/2 transports completed successfully")
-    print("=" * 60)
+    out.write(banner(f"📊 DEMO SUMMARY: {completed}/2 transports completed successfully"))
+    out.flush()
 
     if completed == 2:
         print("🎉 All MCP transport demos completed successfully!")
@@ -232,6 +243,6 @@ async def main() -> None:
 
 if __name__ == "__main__":
     try:
-        asyncio.run(main())
+        run(main())
     except KeyboardInterrupt:
         print("\n👋 Interrupted.")
@@ -7,6 +7,7 @@ from __future__ import annotations
 
 import asyncio
 import sys
+from pathlib import Path
 from typing import Optional
 
 from codex_client import (
@@ -26,6 +27,9 @@ from codex_client import (
 )
 from codex_client.event import McpToolCallBeginEvent, McpToolCallEndEvent
 
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from console import banner, heading, out, read_prompt, run  # noqa: E402
+
 from prompt import WELCOME_MESSAGE, WEATHER_SYSTEM_PROMPT
 from tool import WeatherTool
 
@@ -34,79 +38,87 @@ async def _stream_weather_turn(chat) -> Optional[str]:
     """Stream a single Codex turn for the weather demo."""
     final_reply: Optional[str] = None
 
-    async for event in chat:
-        if isinstance(event, AssistantMessageStream):
-            print("\n🤖 Weather Assistant:\n", end="", flush=True)
-            chunks = []
-            async for chunk in event.stream():
-                chunks.append(chunk)
-                print(chunk, end="", flush=True)
-            final_reply = "".join(chunks).strip() or None
-            print("\n")
-            continue
-
-        if isinstance(event, ReasoningStream):
-            print("🧐 Reasoning:")
-            async for chunk in event.stream():
-                print(f"  {chunk}")
-            continue
-
-        if isinstance(event, CommandStream):
-            command_str = " ".join(event.command)
-            print(f"\n⚡ Executing command: {command_str}")
-            async for chunk in event.stream():
-                if chunk.text is not None:
-                    print(chunk.text, end="", flush=True)
-                else:
-                    print(f"[binary output: {len(chunk.data)} bytes]", flush=True)
-            if event.exit_code is not None:
-                status = "✅" if event.exit_code == 0 else "❌"
-                duration = event.duration.total_seconds() if event.duration else None
-                summary = f"{status} exit {event.exit_code}"
-                if duration is not None:
-                    summary += f" in {duration:.2f}s"
-                print(summary)
-            continue
-
-        if isinstance(event, SessionConfiguredEvent):
-            details = f" model={event.model}"
-            if event.reasoning_effort:
-                details += f" reasoning={event.reasoning_effort.value}"
-            print(f"\n🔧 Session configured:{details}")
-            continue
-
-        if isinstance(event, TaskStartedEvent):
-            context = (
-                f"{event.model_context_window:,} tokens"
-                if event.model_context_window is not None
-                else "unknown context"
-            )
-            print(f"\n🚀 Task started ({context})")
-            continue
-
-        if isinstance(event, TaskCompleteEvent):
-            print("🎉 Task complete")
-            continue
-
-        if isinstance(event, TokenCountEvent):
-            total = event.info.total_token_usage.total_tokens if event.info else None
-            delta = event.info.last_token_usage.total_tokens if event.info else None
-            if total is not None and delta is not None:
-                print(f"💰 Tokens: {total:,} total (+{delta:,} this turn)")
-            continue
-
-        if isinstance(event, McpToolCallBeginEvent):
-            args = ", ".join(f"{k}={v}" for k, v in event.invocation.arguments.items())
-            print(f"\n🔧 Tool call: {event.invocation.server}.{event.invocation.tool}({args})")
-            continue
-
-        if isinstance(event, McpToolCallEndEvent):
-            duration = event.duration.total_seconds()
-            result_type = "Ok" if hasattr(event.result, "Ok") else "Err"
-            print(f"🔧 Tool finished in {duration:.2f}s ({result_type})")
-            continue
-
-    message = await chat.get()
+    # Resolve the final reply concurrently with streaming instead of after it.
+    message_task = asyncio.create_task(chat.get())
+    try:
+        async for event in chat:
+            if isinstance(event, AssistantMessageStream):
+                out.write("\n🤖 Weather Assistant:\n")
+                chunks = []
+                async for batch in event.stream_batches():
+                    chunks.extend(batch)
+                    out.write("".join(batch))
+                final_reply = "".join(chunks).strip() or None
+                out.write("\n\n")
+                continue
+
+            if isinstance(event, ReasoningStream):
+                out.write("🧐 Reasoning:\n")
+                async for chunk in event.stream():
+                    out.write(f"  {chunk}\n")
+                continue
+
+            if isinstance(event, CommandStream):
+                out.write(f"\n⚡ Executing command: {' '.join(event.command)}\n")
+                async for batch in event.stream_batches():
+                    for chunk in batch:
+                        if chunk.text is not None:
+                            out.write(chunk.text)
+                        else:
+                            out.write(f"[binary output: {len(chunk.data)} bytes]\n")
+                if event.exit_code is not None:
+                    status = "✅" if event.exit_code == 0 else "❌"
+                    summary = f"{status} exit {event.exit_code}"
+                    if event.duration is not None:
+                        summary += f" in {event.duration.total_seconds():.2f}s"
+                    out.write(summary + "\n")
+                continue
+
+            if isinstance(event, SessionConfiguredEvent):
+                details = f" model={event.model}"
+                if event.reasoning_effort:
+                    details += f" reasoning={event.reasoning_effort.value}"
+                out.write(f"\n🔧 Session configured:{details}\n")
+                continue
+
+            if isinstance(event, TaskStartedEvent):
+                context = (
+                    f"{event.model_context_window:,} tokens"
+                    if event.model_context_window is not None
+                    else "unknown context"
+                )
+                out.write(f"\n🚀 Task started ({context})\n")
+                continue
+
+            if isinstance(event, TaskCompleteEvent):
+                out.write("🎉 Task complete\n")
+                continue
+
+            if isinstance(event, TokenCountEvent):
+                total = event.info.total_token_usage.total_tokens if event.info else None
+                delta = event.info.last_token_usage.total_tokens if event.info else None
+                if total is not None and delta is not None:
+                    out.write(f"💰 Tokens: {total:,} total (+{delta:,} this turn)\n")
+                continue
+
+            if isinstance(event, McpToolCallBeginEvent):
+                args = ", ".join(f"{k}={v}" for k, v in (event.invocation.arguments or {}).items())
+                out.write(f"\n🔧 Tool call: {event.invocation.server}.{event.invocation.tool}({args})\n")
+                continue
+
+            if isinstance(event, McpToolCallEndEvent):
+                duration = event.duration.total_seconds()
+                result_type = "Ok" if hasattr(event.result, "Ok") else "Err"
+                out.write(f"🔧 Tool finished in {duration:.2f}s ({result_type})\n")
+                continue
+    except BaseException:
+        message_task.cancel()
+        raise
+    finally:
+        # Drain buffered output before the caller goes back to print().
+        out.flush()
+
+    message = await message_task
     return final_reply or message
 
 
@@ -133,9 +145,8 @@ def _build_config(weather_tool: WeatherTool) -> CodexChatConfig:
 
 async def run_weather_demo() -> bool:
     """Run scripted weather demos highlighting different tool flows."""
-    print("\n" + "=" * 60)
-    print("WEATHER DEMO")
-    print("=" * 60)
+    out.write(banner("WEATHER DEMO"))
+    out.flush()
 
     scenarios = [
         (
@@ -172,10 +183,9 @@ async def run_weather_demo() -> bool:
             config = _build_config(weather_tool)
 
             async with Client() as client:
-                for heading, prompt in scenarios:
-                    print(f"\n{heading}")
-                    print("-" * len(heading))
-                    print(f"📝 Prompt: {prompt}")
+                for title, prompt in scenarios:
+                    out.write(f"{heading(title)}📝 Prompt: {prompt}\n")
+                    out.flush()
 
                     chat_prompt = _format_weather_prompt(prompt)
                     chat = await client.create_chat(chat_prompt, config=config)
@@ -183,11 +193,14 @@ async def run_weather_demo() -> bool:
                     preview = (response[:400] + "...") if len(response) > 400 else response
                     print(f"\n📬 Assistant reply preview:\n{preview}\n")
 
-            print("\n" + "=" * 60)
-            print(f"✅ Weather tool invoked {weather_tool.query_count} times")
-            print(f"⭐ Favorites stored: {len(weather_tool.favorite_locations)}")
-            print(f"🕓 Last location queried: {weather_tool.last_location}")
-            print("=" * 60)
+            out.write(
+                banner(
+                    f"✅ Weather tool invoked {weather_tool.query_count} times\n"
+                    f"⭐ Favorites stored: {len(weather_tool.favorite_locations)}\n"
+                    f"🕓 Last location queried: {weather_tool.last_location}"
+                )
+            )
+            out.flush()
             return weather_tool.query_count > 0
 
     except Exception as exc:  # noqa: BLE001
@@ -208,7 +221,7 @@ async def run_interactive_mode() -> None:
 
             while True:
                 try:
-                    user_input = input("\n📝 Your weather question: ").strip()
+                    user_input = await read_prompt("\n📝 Your weather question: ")
                 except (EOFError, KeyboardInterrupt):
                     print("\n👋 Goodbye!")
                     break
@@ -241,6 +254,6 @@ async def main() -> None:
 
 if __name__ == "__main__":
     try:
-        asyncio.run(main())
+        run(main())
     except KeyboardInterrupt:
         print("\n👋 Interrupted.")
@@ -0,0 +1,164 @@
+"""Minimal stand-in for ``codex mcp-server`` speaking JSON-RPC over stdio.
+
+Each call answers ``[pid <pid>] #<n>: <prompt>``, where ``n`` counts the calls
+this process has served, after streaming it as ``codex/event`` notifications.
+Prompts starting with ``slow`` stream one word every 50ms on a background
+thread, so a turn can be abandoned while the server is still talking.
+Prompts starting with ``use-tool`` report an MCP tool call before answering.
+
+Modes (first argument): ``exit-immediately`` fails before the handshake, and
+``slow-start <pidfile>`` records its pid and never answers it.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import pathlib
+import sys
+import threading
+import time
+import uuid
+
+_write_lock = threading.Lock()
+_calls = 0
+
+_TOOLS = [
+    {
+        "name": "codex",
+        "inputSchema": {
+            "type": "object",
+            "properties": {"prompt": {"type": "string"}},
+            "required": ["prompt"],
+        },
+    },
+    {
+        "name": "codex-reply",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "conversationId": {"type": "string"},
+                "prompt": {"type": "string"},
+            },
+            "required": ["conversationId", "prompt"],
+        },
+    },
+]
+
+
+def _send(message: dict) -> None:
+    with _write_lock:
+        sys.stdout.write(json.dumps(message) + "\n")
+        sys.stdout.flush()
+
+
+def _event(request_id: int, msg: dict) -> None:
+    _send(
+        {
+            "jsonrpc": "2.0",
+            "method": "codex/event",
+            "params": {"_meta": {"requestId": request_id}, "id": "0", "msg": msg},
+        }
+    )
+
+
+def _run_turn(request_id: int, arguments: dict, conversation_id: str, delay: float) -> None:
+    global _calls
+    _calls += 1
+    reply = f"[pid {os.getpid()}] #{_calls}: {arguments['prompt']}"
+
+    _event(
+        request_id,
+        {
+            "type": "session_configured",
+            "session_id": conversation_id,
+            "model": "stub",
+            "history_log_id": 0,
+            "history_entry_count": 0,
+            "rollout_path": "/dev/null",
+        },
+    )
+    if arguments["prompt"].startswith("use-tool"):
+        invocation = {"server": "weather", "tool": "add_favorite_location", "arguments": {}}
+        _event(request_id, {"type": "mcp_tool_call_begin", "call_id": "1", "invocation": invocation})
+        _event(
+            request_id,
+            {
+                "type": "mcp_tool_call_end",
+                "call_id": "1",
+                "invocation": invocation,
+                "duration": {"secs": 0, "nanos": 1000},
+                "result": {"Ok": {"content": [{"type": "text", "text": "saved"}]}},
+            },
+        )
+
+    words = reply.split(" ")
+    for index, word in enumerate(words):
+        if delay:
+            time.sleep(delay)
+        delta = word if index == len(words) - 1 else word + " "
+        _event(request_id, {"type": "agent_message_delta", "delta": delta})
+    _event(request_id, {"type": "agent_message", "message": reply})
+    _event(request_id, {"type": "task_complete", "last_agent_message": reply})
+    _send(
+        {
+            "jsonrpc": "2.0",
+            "id": request_id,
+            "result": {
+                "content": [{"type": "text", "text": f"{reply} ({conversation_id})"}],
+                "isError": False,
+            },
+        }
+    )
+
+
+def main() -> int:
+    mode = sys.argv[1] if len(sys.argv) > 1 else "serve"
+
+    if mode == "exit-immediately":
+        return 3
+
+    if mode == "slow-start":
+        pathlib.Path(sys.argv[2]).write_text(str(os.getpid()))
+        time.sleep(30)
+        return 0
+
+    for line in sys.stdin:
+        message = json.loads(line)
+        method = message.get("method")
+        request_id = message.get("id")
+
+        if method == "initialize":
+            _send(
+                {
+                    "jsonrpc": "2.0",
+                    "id": request_id,
+                    "result": {
+                        "protocolVersion": message["params"]["protocolVersion"],
+                        "capabilities": {"tools": {}},
+                        "serverInfo": {"name": "stub-codex", "version": "0.0.0"},
+                    },
+                }
+            )
+        elif method == "tools/list":
+            _send({"jsonrpc": "2.0", "id": request_id, "result": {"tools": _TOOLS}})
+        elif method == "tools/call":
+            params = message["params"]
+            arguments = params.get("arguments") or {}
+            conversation_id = arguments.get("conversationId") or str(uuid.uuid4())
+            if arguments.get("prompt", "").startswith("slow"):
+                threading.Thread(
+                    target=_run_turn,
+                    args=(request_id, arguments, conversation_id, 0.05),
+                    daemon=True,
+                ).start()
+            else:
+                _run_turn(request_id, arguments, conversation_id, 0.0)
+        elif request_id is not None:
+            _send({"jsonrpc": "2.0", "id": request_id, "result": {}})
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,296 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import pathlib
+import sys
+from collections.abc import AsyncIterator
+
+import pytest
+
+from codex_client import (
+    AgentMessageDeltaEvent,
+    Client,
+    CodexChatConfig,
+    CodexProfile,
+    CodexStdioMcpServer,
+    ConnectionError,
+    SandboxMode,
+    get_middleware,
+    setup_mcp_middleware,
+)
+from codex_client.middleware import CodexMiddleware
+
+HELPER = pathlib.Path(__file__).parent / "helpers" / "stub_codex_server.py"
+
+_READ_ONLY = CodexChatConfig(sandbox=SandboxMode.READ_ONLY)
+
+
+@pytest.fixture(autouse=True)
+async def _shutdown_pool() -> AsyncIterator[None]:
+    yield
+    await Client.shutdown_pool()
+
+
+def _client(*args: str, **kwargs: object) -> Client:
+    return Client(sys.executable, [str(HELPER), *args], **kwargs)
+
+
+async def _run_turn(client: Client, prompt: str) -> tuple[str, str]:
+    """Return the streamed deltas and the final reply of a new chat."""
+
+    chat = await client.create_chat(prompt, structured=False)
+    deltas = [event.delta async for event in chat if isinstance(event, AgentMessageDeltaEvent)]
+    return "".join(deltas), await chat.get()
+
+
+async def _run_config_turn(client: Client, prompt: str, config: CodexChatConfig) -> str:
+    chat = await client.create_chat(prompt, config=config)
+    return await chat.get()
+
+
+def _pid(reply: str) -> int:
+    return int(reply.split("]", 1)[0].removeprefix("[pid "))
+
+
+def _process_exists(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    return True
+
+
+async def test_concurrent_clients_only_see_their_own_events() -> None:
+    async def run_one(prompt: str) -> tuple[str, str]:
+        async with _client() as client:
+            return await _run_turn(client, prompt)
+
+    (alpha_streamed, alpha), (beta_streamed, beta) = await asyncio.gather(
+        run_one("slow alpha alpha alpha"),
+        run_one("slow beta beta beta"),
+    )
+
+    assert alpha.endswith(": slow alpha alpha alpha")
+    assert beta.endswith(": slow beta beta beta")
+    assert alpha_streamed == alpha
+    assert beta_streamed == beta
+
+
+async def test_setup_mcp_middleware_is_deprecated_and_returns_the_active_middleware() -> None:
+    async with _client() as client:
+        with pytest.warns(DeprecationWarning):
+            middleware = setup_mcp_middleware()
+        assert middleware is get_middleware()
+        assert middleware is client._middleware
+
+        streamed, reply = await _run_turn(client, "hello")
+        assert streamed == reply
+
+
+async def test_activated_middleware_is_released_on_exit() -> None:
+    assert get_middleware() is None
+    with CodexMiddleware().activated() as middleware:
+        assert get_middleware() is middleware
+    assert get_middleware() is None
+
+
+async def test_pooled_connection_is_reused_after_a_clean_exit() -> None:
+    async with _client(pooled=True) as client:
+        _, first = await _run_turn(client, "one")
+    async with _client(pooled=True) as client:
+        _, second = await _run_turn(client, "two")
+
+    assert _pid(first) == _pid(second)
+    assert second.startswith(f"[pid {_pid(first)}] #2:")
+
+
+async def test_pooled_connection_is_discarded_after_an_aborted_turn() -> None:
+    async with _client(pooled=True) as client:
+        _, first = await _run_turn(client, "one")
+        chat = await client.create_chat("slow abandoned turn with many words", structured=False)
+        await anext(chat.__aiter__())
+
+    async with _client(pooled=True) as client:
+        streamed, second = await _run_turn(client, "two")
+        await asyncio.sleep(0.3)  # long enough for the abandoned turn to finish
+
+    assert _pid(first) != _pid(second)
+    assert streamed == second
+
+
+async def test_idle_pooled_connections_are_closed_after_the_timeout() -> None:
+    async with _client(pooled=True, pool_idle_timeout=0.05) as client:
+        _, first = await _run_turn(client, "one")
+    await asyncio.sleep(0.2)
+    async with _client(pooled=True) as client:
+        _, second = await _run_turn(client, "two")
+
+    assert _pid(first) != _pid(second)
+
+
+async def test_open_many_connects_every_client() -> None:
+    clients = await Client.open_many(
+        [{"command": sys.executable, "args": [str(HELPER)]} for _ in range(3)]
+    )
+    try:
+        replies = await asyncio.gather(
+            *(_run_turn(client, f"prompt {index}") for index, client in enumerate(clients))
+        )
+    finally:
+        for client in clients:
+            await client.aclose()
+
+    assert len({_pid(reply) for _, reply in replies}) == 3
+    assert all(not client.is_connected for client in clients)
+
+
+async def test_open_many_closes_the_connected_clients_when_one_fails(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    opened: list[Client] = []
+    original_enter = Client._enter_in_background
+
+    async def recording_enter(self: Client) -> Client:
+        opened.append(self)
+        return await original_enter(self)
+
+    monkeypatch.setattr(Client, "_enter_in_background", recording_enter)
+
+    with pytest.raises(ConnectionError):
+        await Client.open_many(
+            [
+                {"command": sys.executable, "args": [str(HELPER)]},
+                {"command": sys.executable, "args": [str(HELPER), "exit-immediately"]},
+                {"command": sys.executable, "args": [str(HELPER)]},
+            ]
+        )
+
+    assert len(opened) == 3
+    assert all(not client.is_connected for client in opened)
+
+
+async def test_memoized_read_only_calls_are_replayed() -> None:
+    async with _client(memoize=True) as client:
+        first = await _run_config_turn(client, "question", _READ_ONLY)
+        replayed = await _run_config_turn(client, "question", _READ_ONLY)
+        other = await _run_config_turn(client, "other question", _READ_ONLY)
+
+        profile = CodexProfile(model="stub", sandbox=SandboxMode.READ_ONLY)
+        via_profile = CodexChatConfig(profile=profile)
+        profiled = await _run_config_turn(client, "profiled", via_profile)
+        profiled_again = await _run_config_turn(client, "profiled", via_profile)
+
+    assert replayed == first
+    assert first.endswith("#1: question")
+    assert other.endswith("#2: other question")
+    assert profiled_again == profiled
+
+
+async def test_memo_skips_and_clears_on_calls_outside_the_read_only_sandbox() -> None:
+    writable = CodexChatConfig(sandbox=SandboxMode.WORKSPACE_WRITE)
+
+    async with _client(memoize=True) as client:
+        first = await _run_config_turn(client, "question", _READ_ONLY)
+        write = await _run_config_turn(client, "write", writable)
+        write_again = await _run_config_turn(client, "write", writable)
+        after_write = await _run_config_turn(client, "question", _READ_ONLY)
+        default = await _run_config_turn(client, "default", CodexChatConfig())
+        default_again = await _run_config_turn(client, "default", CodexChatConfig())
+
+    assert write != write_again
+    assert first.endswith("#1: question")
+    assert after_write.endswith("#4: question")
+    assert default != default_again
+
+
+async def test_memo_replays_resumed_turns_of_read_only_conversations_only() -> None:
+    writable = CodexChatConfig(sandbox=SandboxMode.WORKSPACE_WRITE)
+
+    async with _client(memoize=True) as client:
+        chat = await client.create_chat("start", config=_READ_ONLY)
+        await chat.get()
+        await chat.resume("follow up")
+        first = await chat.get()
+        await chat.resume("follow up")
+        replayed = await chat.get()
+
+        chat = await client.create_chat("start", config=writable)
+        await chat.get()
+        await chat.resume("follow up")
+        write = await chat.get()
+        await chat.resume("follow up")
+        write_again = await chat.get()
+
+    assert replayed == first
+    assert write != write_again
+
+
+@pytest.mark.parametrize("pooled", [False, True])
+async def test_cancelled_connect_stops_the_server(tmp_path: pathlib.Path, pooled: bool) -> None:
+    pidfile = tmp_path / "pid"
+    client = _client("slow-start", str(pidfile), pooled=pooled)
+
+    task = asyncio.create_task(client.__aenter__())
+    while not pidfile.exists() or not pidfile.read_text():
+        await asyncio.sleep(0.01)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    assert not _process_exists(int(pidfile.read_text()))
+    assert not client.is_connected
+    assert get_middleware() is None
+
+
+async def test_open_many_closes_the_connected_clients_when_cancelled(
+    tmp_path: pathlib.Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    pidfile = tmp_path / "pid"
+    opened: list[Client] = []
+    original_enter = Client._enter_in_background
+
+    async def recording_enter(self: Client) -> Client:
+        opened.append(self)
+        return await original_enter(self)
+
+    monkeypatch.setattr(Client, "_enter_in_background", recording_enter)
+
+    task = asyncio.create_task(
+        Client.open_many(
+            [
+                {"command": sys.executable, "args": [str(HELPER)]},
+                {"command": sys.executable, "args": [str(HELPER), "slow-start", str(pidfile)]},
+            ]
+        )
+    )
+    while not opened or not opened[0].is_connected or not pidfile.exists():
+        await asyncio.sleep(0.01)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    assert len(opened) == 2
+    assert all(not client.is_connected for client in opened)
+    assert not _process_exists(int(pidfile.read_text()))
+
+
+async def test_memo_skips_read_only_calls_that_can_reach_mcp_tools() -> None:
+    with_servers = CodexChatConfig(
+        sandbox=SandboxMode.READ_ONLY,
+        mcp_servers=[CodexStdioMcpServer(name="weather", command="weather-server")],
+    )
+
+    async with _client(memoize=True) as client:
+        configured = await _run_config_turn(client, "question", with_servers)
+        configured_again = await _run_config_turn(client, "question", with_servers)
+
+        remembered = await _run_config_turn(client, "remembered", _READ_ONLY)
+        used_tool = await _run_config_turn(client, "use-tool now", _READ_ONLY)
+        used_tool_again = await _run_config_turn(client, "use-tool now", _READ_ONLY)
+        after_tool = await _run_config_turn(client, "remembered", _READ_ONLY)
+
+    assert configured != configured_again
+    assert used_tool != used_tool_again
+    assert after_tool != remembered
@@ -0,0 +1,11 @@
+from __future__ import annotations
+
+from codex_client import Duration
+
+
+def test_duration_total_seconds_follows_model_copy_updates() -> None:
+    duration = Duration(secs=1, nanos=500_000_000)
+
+    assert duration.total_seconds() == 1.5
+    assert duration.model_copy(update={"secs": 5}).total_seconds() == 5.5
+    assert hash(duration) == hash(Duration(secs=1, nanos=500_000_000))
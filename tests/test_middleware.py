@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+from codex_client import AgentMessageDeltaEvent, AgentReasoningDeltaEvent, TaskCompleteEvent
+from codex_client.middleware import _MAX_COALESCED_DELTA, _EventQueue
+
+
+def _drain(queue: _EventQueue) -> list:
+    items = []
+    while not queue.empty():
+        items.append(queue.get_nowait())
+    return items
+
+
+def test_event_queue_merges_consecutive_deltas_of_one_kind() -> None:
+    queue = _EventQueue()
+    for delta in ("Hel", "lo", " world"):
+        queue.put_nowait(AgentMessageDeltaEvent(delta=delta, conversation_id="a"))
+    for delta in ("thin", "king"):
+        queue.put_nowait(AgentReasoningDeltaEvent(delta=delta, conversation_id="a"))
+
+    items = _drain(queue)
+
+    assert [type(item) for item in items] == [AgentMessageDeltaEvent, AgentReasoningDeltaEvent]
+    assert [item.delta for item in items] == ["Hello world", "thinking"]
+
+
+def test_event_queue_keeps_deltas_of_other_conversations_apart() -> None:
+    queue = _EventQueue()
+    queue.put_nowait(AgentMessageDeltaEvent(delta="a1", conversation_id="a"))
+    queue.put_nowait(AgentMessageDeltaEvent(delta="b1", conversation_id="b"))
+    queue.put_nowait(AgentMessageDeltaEvent(delta="b2", conversation_id="b"))
+
+    assert [item.delta for item in _drain(queue)] == ["a1", "b1b2"]
+
+
+def test_event_queue_never_merges_across_another_event() -> None:
+    queue = _EventQueue()
+    queue.put_nowait(AgentMessageDeltaEvent(delta="before"))
+    queue.put_nowait(TaskCompleteEvent(last_agent_message="before"))
+    queue.put_nowait(AgentMessageDeltaEvent(delta="after"))
+
+    items = _drain(queue)
+
+    assert [type(item) for item in items] == [
+        AgentMessageDeltaEvent,
+        TaskCompleteEvent,
+        AgentMessageDeltaEvent,
+    ]
+    assert items[0].delta == "before"
+    assert items[2].delta == "after"
+
+
+def test_event_queue_caps_the_size_of_a_merged_delta() -> None:
+    queue = _EventQueue()
+    chunk = "x" * (_MAX_COALESCED_DELTA // 2)
+    for _ in range(3):
+        queue.put_nowait(AgentMessageDeltaEvent(delta=chunk))
+
+    items = _drain(queue)
+
+    assert [len(item.delta) for item in items] == [_MAX_COALESCED_DELTA, len(chunk)]
+
+
+def test_event_queue_does_not_touch_consumed_deltas() -> None:
+    queue = _EventQueue()
+    queue.put_nowait(AgentMessageDeltaEvent(delta="first"))
+    consumed = queue.get_nowait()
+    queue.put_nowait(AgentMessageDeltaEvent(delta="second"))
+
+    assert consumed.delta == "first"
+    assert [item.delta for item in _drain(queue)] == ["second"]
+
+
+def test_event_queue_clear_drops_everything_queued() -> None:
+    queue = _EventQueue()
+    queue.put_nowait(AgentMessageDeltaEvent(delta="a"))
+    queue.put_nowait(TaskCompleteEvent())
+    queue.clear()
+
+    assert queue.empty()
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import pytest
+
+from codex_client import AgentMessageDeltaEvent
+from codex_client.middleware.parser import _slice_dict, extract_event_payload, parse_event_from_message
+
+
+def _warning(params: dict) -> str:
+    # mcp logs the rejected notification with its params as a Python repr.
+    return (
+        "Failed to validate notification: 2 validation errors for ServerNotification. "
+        f"Message was: method='codex/event' params={params!r} jsonrpc='2.0'"
+    )
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        {"delta": "closing } and opening { braces"},
+        {"delta": "quotes ' and \" together"},
+        {"delta": "escaped \\' quote and trailing backslash \\"},
+        {"delta": "}}}'\"{{{"},
+        {"outer": {"inner": {"deepest": "}"}}, "sibling": ["{", "}"]},
+        {},
+    ],
+)
+def test_slice_dict_returns_the_balanced_literal(value: dict) -> None:
+    literal = repr(value)
+    message = f"prefix {literal} trailing {{'not': 'part of it'}}"
+
+    assert _slice_dict(message, message.index("{")) == literal
+
+
+@pytest.mark.parametrize(
+    "fragment",
+    [
+        "{'delta': 'never closed}",
+        '{"delta": "escaped at the end \\"}',
+        "{'outer': {'inner': 1}",
+    ],
+)
+def test_slice_dict_returns_none_for_unterminated_input(fragment: str) -> None:
+    assert _slice_dict(fragment, 0) is None
+
+
+def test_extract_event_payload_merges_meta_and_conversation_id() -> None:
+    params = {
+        "_meta": {"requestId": 3},
+        "id": "0",
+        "conversationId": "conv-1",
+        "msg": {"type": "agent_message_delta", "delta": "a } 'b' \"c\" \\ {d"},
+    }
+
+    assert extract_event_payload(_warning(params)) == {
+        "type": "agent_message_delta",
+        "delta": "a } 'b' \"c\" \\ {d",
+        "_meta": {"requestId": 3},
+        "conversationId": "conv-1",
+    }
+
+
+def test_parse_event_from_message_returns_typed_events() -> None:
+    params = {"_meta": {"requestId": 3}, "id": "0", "msg": {"type": "agent_message_delta", "delta": "{x}"}}
+
+    event = parse_event_from_message(_warning(params))
+
+    assert isinstance(event, AgentMessageDeltaEvent)
+    assert event.delta == "{x}"
+
+
+def test_parse_event_from_message_ignores_messages_without_an_event() -> None:
+    assert parse_event_from_message("Failed to validate notification: nothing here") is None
+    assert parse_event_from_message(_warning({"id": "0", "msg": {"type": "unknown"}})) is None